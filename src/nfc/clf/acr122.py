@@ -238,3 +238,8 @@ class Chipset(pn532.Chipset):
             log.error("received pseudo apdu with error status")
             raise IOError(errno.EIO, os.strerror(errno.EIO))
         return frame[2:-2]
+
+    def command_frame(self, cmd_code, frame, timeout):
+        # The PN532 host command frame is not sent as is but only the
+        # command data between frame header and checksum/postamble.
+        return self.command(cmd_code, frame[7:-2], timeout)
@@ -650,11 +650,23 @@ class Device(object):
         return (data[-2], data[-1]) == (crc & 0xff, crc >> 8)
 
 
+def crc_table(poly):
+    # Return the 256 entry lookup table for a bit reflected 16-bit
+    # CRC with polynomial *poly*, indexed by the low byte of the CRC
+    # register xor'ed with the next data byte.
+    table = []
+    for octet in range(256):
+        reg = octet
+        for pos in range(8):
+            reg = (reg >> 1) ^ poly if reg & 1 else reg >> 1
+        table.append(reg)
+    return tuple(table)
+
+
+CRC_TABLE = crc_table(0x8408)  # ISO/IEC 14443-3 CRC_A/CRC_B
+
+
 def calculate_crc(data, size, reg):
     for octet in data[:size]:
-        for pos in range(8):
-            bit = (reg ^ ((octet >> pos) & 1)) & 1
-            reg = reg >> 1
-            if bit:
-                reg = reg ^ 0x8408
+        reg = (reg >> 8) ^ CRC_TABLE[(reg ^ octet) & 0xFF]
     return reg
@@ -59,6 +59,7 @@ import os
 import sys
 import time
 import errno
+from struct import pack
 
 import logging
 log = logging.getLogger(__name__)
@@ -147,22 +148,26 @@ class Chipset(pn53x.Chipset):
     def set_serial_baudrate(self, baudrate):
         br = (9600, 19200, 38400, 57600, 115200,
               230400, 460800, 921600, 1288000)
-        self.command(0x10, bytearray([br.index(baudrate)]), timeout=0.1)
+        self.command(0x10, pack("B", br.index(baudrate)), timeout=0.1)
         self.write_frame(self.ACK)
-        time.sleep(0.001)
+        self.transport.change_baudrate(baudrate)
+        time.sleep(0.001)  # give the chip time to switch its uart
 
     def sam_configuration(self, mode, timeout=0, irq=False):
         mode = ("normal", "virtual", "wired", "dual").index(mode) + 1
-        self.command(0x14, bytearray([mode, timeout, int(irq)]), timeout=0.1)
+        self.command(0x14, pack("BBB", mode, timeout, irq), timeout=0.1)
 
     power_down_wakeup_src = ("INT0", "INT1", "rfu", "RF",
                              "HSU", "SPI", "GPIO", "I2C")
+    WAKEUP_BIT = {src: 1 << i for i, src in enumerate(power_down_wakeup_src)
+                  if src != "rfu"}
 
     def power_down(self, wakeup_enable, generate_irq=False):
+        if isinstance(wakeup_enable, str):
+            wakeup_enable = [src.strip() for src in wakeup_enable.split(",")]
         wakeup_set = 0
-        for i, src in enumerate(self.power_down_wakeup_src):
-            if src in wakeup_enable:
-                wakeup_set |= 1 << i
+        for src in wakeup_enable:
+            wakeup_set |= self.WAKEUP_BIT.get(src, 0)
         cmd_data = bytearray([wakeup_set, int(generate_irq)])
         data = self.command(0x16, cmd_data, timeout=0.1)
         if data[0] != 0:
@@ -176,12 +181,68 @@ class Chipset(pn53x.Chipset):
         assert len(felica_params) == 18
         assert len(nfcid3t) == 10
 
-        data = (bytearray([mode]) + mifare_params + felica_params + nfcid3t +
-                bytearray([len(general_bytes)]) + general_bytes +
-                bytearray([len(historical_bytes)]) + historical_bytes)
+        data = bytearray().join([
+            bytearray([mode]), mifare_params, felica_params, nfcid3t,
+            bytearray([len(general_bytes)]), general_bytes,
+            bytearray([len(historical_bytes)]), historical_bytes])
         return self.command(0x8c, data, timeout)
 
 
+# Command frames for the fixed chipset configuration that is sent
+# with every device initialization. They are only built once.
+_FRAME_SAM_NORMAL = bytes(Chipset.build_frame(0x14, b"\x01\x00\x00"))
+_FRAME_SET_PARAMS_0 = bytes(Chipset.build_frame(0x12, b"\x00"))
+_FRAME_RFCFG_02 = bytes(Chipset.build_frame(0x32, b"\x02\x00\x0B\x0A"))
+_FRAME_RFCFG_04 = bytes(Chipset.build_frame(0x32, b"\x04\x00"))
+_FRAME_RFCFG_05 = bytes(Chipset.build_frame(0x32, b"\x05\x01\x00\x01"))
+_FRAME_RFCFG_0A = bytes(Chipset.build_frame(0x32, bytearray.fromhex(
+    "0A 59 F4 3F 11 4D 85 61 6F 26 62 87")))  # Type A 106 kbps
+_FRAME_RFCFG_0B = bytes(Chipset.build_frame(0x32, bytearray.fromhex(
+    "0B 69 FF 3F 11 41 85 61 6F")))  # Type F 212/424 kbps
+_FRAME_RFCFG_0C = bytes(Chipset.build_frame(0x32, bytearray.fromhex(
+    "0C FF 04 85")))  # Type B 106 kbps
+_FRAME_RFCFG_0D = bytes(Chipset.build_frame(0x32, bytearray.fromhex(
+    "0D 85 15 8A 85 08 B2 85 01 DA")))  # ISO/IEC 14443-4 212/424/848 kbps
+
+# Addresses of the CIU registers that are programmed directly for
+# Type 1 Tag commands.
+_CIU_ADDR = {name: Chipset.REGBYNAME[name] for name in (
+    "CIU_FIFOData", "CIU_BitFraming", "CIU_Command",
+    "CIU_ManualRCV", "CIU_FIFOLevel")}
+
+_TT1_TEMPLATE = {}
+
+
+def _tt1_register_write(size):
+    # Return a copy of the serialized WriteRegister program that
+    # sends a Type 1 Tag command of *size* bytes (including CRC). The
+    # program only depends on the command size, so it is built once
+    # with zero FIFO data bytes and the caller patches the command
+    # code at offset 2 and the command data at every 9th offset from
+    # 17 (the FIFOData value of each Transmit/NoCmdChange block).
+    try:
+        return bytearray(_TT1_TEMPLATE[size])
+    except KeyError:
+        fifo_data = _CIU_ADDR["CIU_FIFOData"]
+        bit_framing = _CIU_ADDR["CIU_BitFraming"]
+        command = _CIU_ADDR["CIU_Command"]
+        register_write = [
+            (fifo_data,      0x00),  # CMD_CODE
+            (bit_framing,    0x07),  # 7 bits
+            (command,        0x04),  # Transmit
+            (bit_framing,    0x00),  # 8 bits
+            (_CIU_ADDR["CIU_ManualRCV"], 0x30),  # ParityDisable
+        ]
+        data_block = pack(">HBHBHB",
+                          fifo_data, 0x00,  # CMD_DATA
+                          command,   0x04,  # Transmit
+                          command,   0x07)  # NoCmdChange
+        _TT1_TEMPLATE[size] = bytes(bytearray().join(
+            [pack(">HB", addr, value) for addr, value in register_write])
+            + data_block * (size - 1) + pack(">HB", command, 0x08))  # Receive
+        return bytearray(_TT1_TEMPLATE[size])
+
+
 class Device(pn53x.Device):
     # Device driver for PN532 based contactless frontends.
 
@@ -193,26 +254,22 @@ class Device(pn53x.Device):
         self._chipset_name = "PN5{0:02x}v{1}.{2}".format(ic, ver, rev)
         self.log.debug("chipset is a {0}".format(self._chipset_name))
 
-        self.chipset.set_parameters(0b00000000)
-        self.chipset.rf_configuration(0x02, b"\x00\x0B\x0A")
-        self.chipset.rf_configuration(0x04, b"\x00")
-        self.chipset.rf_configuration(0x05, b"\x01\x00\x01")
+        self.chipset.command_frame(0x12, _FRAME_SET_PARAMS_0, timeout=0.1)
+        self.chipset.command_frame(0x32, _FRAME_RFCFG_02, timeout=0.1)
+        self.chipset.command_frame(0x32, _FRAME_RFCFG_04, timeout=0.1)
+        self.chipset.command_frame(0x32, _FRAME_RFCFG_05, timeout=0.1)
 
         self.log.debug("write analog settings for Type A 106 kbps")
-        data = bytearray.fromhex("59 F4 3F 11 4D 85 61 6F 26 62 87")
-        self.chipset.rf_configuration(0x0A, data)
+        self.chipset.command_frame(0x32, _FRAME_RFCFG_0A, timeout=0.1)
 
         self.log.debug("write analog settings for Type F 212/424 kbps")
-        data = bytearray.fromhex("69 FF 3F 11 41 85 61 6F")
-        self.chipset.rf_configuration(0x0B, data)
+        self.chipset.command_frame(0x32, _FRAME_RFCFG_0B, timeout=0.1)
 
         self.log.debug("write analog settings for Type B 106 kbps")
-        data = bytearray.fromhex("FF 04 85")
-        self.chipset.rf_configuration(0x0C, data)
+        self.chipset.command_frame(0x32, _FRAME_RFCFG_0C, timeout=0.1)
 
         self.log.debug("write analog settings for 14443-4 212/424/848 kbps")
-        data = bytearray.fromhex("85 15 8A 85 08 B2 85 01 DA")
-        self.chipset.rf_configuration(0x0D, data)
+        self.chipset.command_frame(0x32, _FRAME_RFCFG_0D, timeout=0.1)
 
         self.mute()
 
@@ -223,10 +280,11 @@ class Device(pn53x.Device):
         time.sleep(0.01)
 
         # When using the high speed uart we must set the baud rate
-        # back to 115.2 kbps, otherwise we can't talk next time.
-        if self.chipset.transport.TYPE == "TTY":
+        # back to 115.2 kbps, otherwise we can't talk next time. The
+        # host side setting tells whether the speed was changed.
+        transport = self.chipset.transport
+        if transport.TYPE == "TTY" and transport.baudrate != 115200:
             self.chipset.set_serial_baudrate(115200)
-            self.chipset.transport.baudrate = 115200
 
         # Set the chip to sleep mode with some wakeup sources.
         # self.chipset.power_down(wakeup_enable=("I2C", "SPI", "HSU"))
@@ -294,36 +352,27 @@ class Device(pn53x.Device):
         # as normal frames. Reading is also a bit complicated because
         # for sending we have to disable the parity generator which
         # means that we will also receive the parity bits, thus 9 bits
-        # received per 8 data bits. And because they are already
-        # reversed in the FIFO we must swap before parity removal and
-        # afterwards (maybe this could be optimized a bit)
+        # received per 8 data bits.
         data = self.add_crc_b(data)
-        register_write = []
-        register_write.append(("CIU_FIFOData",   data[0]))  # CMD_CODE
-        register_write.append(("CIU_BitFraming",    0x07))  # 7 bits
-        register_write.append(("CIU_Command",       0x04))  # Transmit
-        register_write.append(("CIU_BitFraming",    0x00))  # 8 bits
-        register_write.append(("CIU_ManualRCV",     0x30))  # ParityDisable
-        for i in range(1, len(data)):
-            register_write.append(("CIU_FIFOData", data[i]))  # CMD_DATA
-            register_write.append(("CIU_Command",     0x04))  # Transmit
-            register_write.append(("CIU_Command",     0x07))  # NoCmdChange
-        register_write.append(("CIU_Command",       0x08))    # Receive
-        self.chipset.write_register(*register_write)
+        register_write = _tt1_register_write(len(data))
+        register_write[2] = data[0]         # CMD_CODE
+        register_write[17:-3:9] = data[1:]  # CMD_DATA
+        self.chipset.write_register_raw(register_write)
         if data[0] == 0x54:  # WRITE-E8
             time.sleep(0.006)  # assuming same response time as WRITE-E
         if data[0] == 0x1B:  # WRITE-NE8
             time.sleep(0.003)  # assuming same response time as WRITE-NE
+        # Parity must stay disabled until the response is received,
+        # so it can not be re-enabled within the register program.
         self.chipset.write_register(("CIU_ManualRCV", 0x20))  # enable parity
         fifo_level = self.chipset.read_register("CIU_FIFOLevel")
         if fifo_level == 0:
             raise nfc.clf.TimeoutError
-        data = self.chipset.read_register(*(fifo_level * ["CIU_FIFOData"]))
-        data = ''.join(["{:08b}".format(octet)[::-1] for octet in data])
-        data = [int(data[i:i+8][::-1], 2) for i in range(0, len(data)-8, 9)]
+        data = self.chipset.read_fifo(fifo_level)
+        data = self._tt1_strip_parity(data)
         if self.check_crc_b(data) is False:
             raise nfc.clf.TransmissionError("crc_b check error")
-        return bytearray(data[0:-2])
+        return data[0:-2]
 
     def listen_tta(self, target, timeout):
         """Listen *timeout* seconds for a Type A activation at 106 kbps. The
@@ -413,9 +462,8 @@ def init(transport):
         if not transport.read(timeout=100).startswith(get_version_rsp):
             raise IOError(errno.ENODEV, os.strerror(errno.ENODEV))
 
-        sam_configuration_cmd = bytearray.fromhex("0000ff05fbd4140100001700")
         sam_configuration_rsp = bytearray.fromhex("0000ff02fed5151600")
-        transport.write(long_preamble + sam_configuration_cmd)
+        transport.write(long_preamble + _FRAME_SAM_NORMAL)
         if not transport.read(timeout=100) == Chipset.ACK:
             raise IOError(errno.ENODEV, os.strerror(errno.ENODEV))
         if not transport.read(timeout=100) == sam_configuration_rsp:
@@ -441,7 +489,7 @@ def init(transport):
                 raise IOError(errno.ENODEV, os.strerror(errno.ENODEV))
 
             transport.write(Chipset.ACK)
-            transport.open(transport.port, baudrate)
+            transport.change_baudrate(baudrate)
             log.debug("changed uart speed to %d baud", baudrate)
             time.sleep(0.001)
 
@@ -283,9 +283,7 @@ class Device(pn53x.Device):
         # are normal frames. Reading is also a bit complicated because
         # for sending we have to disable the parity generator which
         # means that we will also receive the parity bits, thus 9 bits
-        # received per 8 data bits. And because they are already
-        # reversed in the FIFO we must swap before parity removal and
-        # afterwards (maybe this could be a bit more optimized).
+        # received per 8 data bits.
         data = self.add_crc_b(data)
         self.chipset.write_register(
             ("CIU_FIFOData", data[0]),  # CMD_CODE
@@ -312,12 +310,11 @@ class Device(pn53x.Device):
         fifo_level = self.chipset.read_register("CIU_FIFOLevel")
         if fifo_level == 0:
             raise nfc.clf.TimeoutError
-        data = self.chipset.read_register(*(fifo_level * ["CIU_FIFOData"]))
-        data = ''.join(["{:08b}".format(octet)[::-1] for octet in data])
-        data = [int(data[i:i+8][::-1], 2) for i in range(0, len(data)-8, 9)]
+        data = self.chipset.read_fifo(fifo_level)
+        data = self._tt1_strip_parity(data)
         if self.check_crc_b(data) is False:
             raise nfc.clf.TransmissionError("crc_b check error")
-        return bytearray(data[:-2])
+        return data[:-2]
 
     def listen_tta(self, target, timeout):
         """Listen *timeout* seconds for a Type A activation at 106 kbps. The
@@ -104,6 +104,7 @@ class Chipset(object):
         0x632F: "CIU_RFT4",
     }
     REGBYNAME = {v: k for k, v in REG.items()}
+    FIFO_ADDR = pack(">H", REGBYNAME["CIU_FIFOData"])
 
     class Error(Exception):
         def __init__(self, errno, strerr):
@@ -158,23 +159,48 @@ class Chipset(object):
           error was received.
 
         """
+        frame = None
         if cmd_data is not None:
-            assert len(cmd_data) <= self.host_command_frame_max_size - 2
-            self.log.log(logging.DEBUG-1, "{} {} {:.3f}".format(
-                    self.CMD[cmd_code], hexlify(cmd_data).decode(), timeout))
+            frame = self.build_frame(cmd_code, cmd_data)
+        return self.command_frame(cmd_code, frame, timeout)
 
-            if len(cmd_data) < 254:
-                head = self.SOF + bytearray([len(cmd_data)+2]) \
-                       + bytearray([254-len(cmd_data)])
-            else:
-                head = self.SOF + b'\xFF\xFF' + pack(">H", len(cmd_data)+2)
-                head.append((256 - sum(head[-2:])) & 0xFF)
+    @classmethod
+    def build_frame(cls, cmd_code, cmd_data):
+        """Return the host command frame for the 8-bit integer *cmd_code*
+        and the command parameters *cmd_data*. A normal frame is
+        constructed for up to 253 data bytes, otherwise an extended
+        frame. The result can be sent with :meth:`command_frame`,
+        which allows to build frames for fixed commands only once.
+
+        """
+        assert len(cmd_data) <= cls.host_command_frame_max_size - 2
+
+        if len(cmd_data) < 254:
+            head = cls.SOF + bytearray([len(cmd_data)+2]) \
+                   + bytearray([254-len(cmd_data)])
+        else:
+            head = cls.SOF + b'\xFF\xFF' + pack(">H", len(cmd_data)+2)
+            head.append((256 - sum(head[-2:])) & 0xFF)
+
+        data = bytearray([0xD4, cmd_code]) + cmd_data
+        tail = bytearray([(256 - sum(data)) & 0xFF, 0])
+        return head + data + tail
 
-            data = bytearray([0xD4, cmd_code]) + cmd_data
-            tail = bytearray([(256 - sum(data)) & 0xFF, 0])
+    def command_frame(self, cmd_code, frame, timeout):
+        """Send the command *frame* that was constructed with
+        :meth:`build_frame` for *cmd_code* and return the chip
+        response data as described for :meth:`command`. If *frame*
+        is None the command is assumed to be acknowledged already and
+        only the response is received.
 
+        """
+        if frame is not None:
+            # command data starts after the normal or extended header
+            data = frame[10 if frame[3:5] == b'\xFF\xFF' else 7:-2]
+            self.log.log(logging.DEBUG-1, "{} {} {:.3f}".format(
+                    self.CMD[cmd_code], hexlify(data).decode(), timeout))
             try:
-                self.write_frame(head + data + tail)
+                self.write_frame(frame)
                 frame = self.read_frame(timeout=100)
             except IOError:
                 self.log.error("input/output error while waiting for ack")
@@ -310,6 +336,17 @@ class Chipset(object):
         data = self._read_register(data)
         return list(data) if len(data) > 1 else data[0]
 
+    def read_fifo(self, count):
+        """Send a ReadRegister command that reads *count* bytes from the
+        CIU FIFO and return them as a bytearray. This is the same as
+        reading *count* times the ``CIU_FIFOData`` register but also
+        returns a bytearray for a single byte. ::
+
+          fifo_data = Chipset.read_fifo(Chipset.read_register("CIU_FIFOLevel"))
+
+        """
+        return bytearray(self._read_register(self.FIFO_ADDR * count))
+
     def _read_register(self, data):
         cname = self.__class__.__module__ + '.' + self.__class__.__name__
         raise NotImplementedError(cname + "._read_register")
@@ -325,14 +362,48 @@ class Chipset(object):
           Chipset.write_register((0x6301, 0x00), ("CIU_TxMode", 0x00))
 
         """
-        def addr(r):
-            return self.REGBYNAME[r] if type(r) is str else r
-
         assert type(args) in (tuple, list)
         if len(args) == 2 and type(args[1]) == int:
             args = [args]
-        args = [(addr(reg), val) for reg, val in args]
-        data = b''.join([pack(">HB", reg, val) for reg, val in args])
+        self._write_register(self.register_data(*args))
+
+    @classmethod
+    def register_data(cls, *args):
+        """Return the WriteRegister data for the (address, value) tuple
+        arguments, a register may be given by address or name. The
+        result can be concatenated and sent with
+        :meth:`write_register_raw`. ::
+
+          Chipset.register_data(("CIU_Mode", 0x00), (0x6302, 0x00))
+
+        """
+        def addr(r):
+            return cls.REGBYNAME[r] if type(r) is str else r
+
+        return bytearray().join(
+            [pack(">HB", addr(reg), val) for reg, val in args])
+
+    @classmethod
+    def fifo_register_data(cls, data):
+        """Return the WriteRegister data that writes the bytes of *data*
+        into the CIU FIFO. This is the same as :meth:`register_data`
+        with a ``CIU_FIFOData`` tuple for each byte. ::
+
+          Chipset.write_register_raw(Chipset.fifo_register_data(b'ab'))
+
+        """
+        regs = bytearray(cls.FIFO_ADDR + b'\0') * len(data)
+        regs[2::3] = data
+        return regs
+
+    def write_register_raw(self, data):
+        """Send a WriteRegister command with *data* that is already the
+        sequence of 16-bit big endian register address and 8-bit value
+        triples, i.e. without name resolution and encoding. ::
+
+          Chipset.write_register_raw(bytearray.fromhex("6301 00 6302 00"))
+
+        """
         self._write_register(data)
 
     def _write_register(self, data):
@@ -682,6 +753,15 @@ class Device(device.Device):
         cname = self.__class__.__module__ + '.' + self.__class__.__name__
         raise NotImplementedError(cname + "._tt1_send_cmd_recv_rsp()")
 
+    @staticmethod
+    def _tt1_strip_parity(data):
+        # Return the data bytes of a Type 1 Tag response that was
+        # received with the CIU parity check disabled. The FIFO then
+        # holds 9 bits per data byte, LSB first, so as a little endian
+        # integer the data bytes are found at every 9th bit position.
+        bits, size = int.from_bytes(bytearray(data), 'little'), 8 * len(data)
+        return bytearray((bits >> i) & 0xFF for i in range(0, size - 8, 9))
+
     def _tt2_send_cmd_recv_rsp(self, data, timeout):
         # The Type2Tag implementation needs to receive the Mifare
         # ACK/NAK responses but the chipset reports them as crc error
@@ -810,14 +890,14 @@ class Device(device.Device):
         nfcf_params = bytearray(target.sensf_res[1:])
         self.log.debug("nfcf_params %s", hexlify(nfcf_params).decode())
 
-        regs = [
+        regs = self.chipset.register_data(
             ("CIU_Command",   0b00000000),  # Idle command
-            ("CIU_FIFOLevel", 0b10000000),  # clear fifo
-        ]
-        regs.extend(zip(25*["CIU_FIFOData"],
-                        nfca_params + nfcf_params + b"\0"))
-        regs.append(("CIU_Command", 0b00000001))  # Configure command
-        self.chipset.write_register(*regs)
+            ("CIU_FIFOLevel", 0b10000000))  # clear fifo
+        regs += self.chipset.fifo_register_data(
+            nfca_params + nfcf_params + b"\0")
+        regs += self.chipset.register_data(
+            ("CIU_Command",   0b00000001))  # Configure command
+        self.chipset.write_register_raw(regs)
         regs = [
             ("CIU_Control",   0b00000000),  # act as target (b4=0)
             ("CIU_Mode",      0b00111111),  # disable mode detector (b2=1)
@@ -842,8 +922,7 @@ class Device(device.Device):
             if commirq & 0b00110000 == 0b00110000:
                 self.chipset.write_register("CIU_CommIRq", 0b00110000)
                 fifo_size = self.chipset.read_register("CIU_FIFOLevel")
-                fifo_read = fifo_size * ["CIU_FIFOData"]
-                fifo_data = bytearray(self.chipset.read_register(*fifo_read))
+                fifo_data = self.chipset.read_fifo(fifo_size)
                 if fifo_data and len(fifo_data) == fifo_data[0]:
                     self.log.debug("%s rcvd %s", target.brty,
                                    hexlify(fifo_data).decode())
@@ -991,15 +1070,15 @@ class Device(device.Device):
         return ("106A", "212F", "424F")[dri]
 
     def _tt3_send_rsp_recv_cmd(self, target, data, timeout):
-        regs = [
+        regs = self.chipset.register_data(
             ("CIU_FIFOLevel", 0b10000000),  # clear fifo read/write pointer
             ("CIU_CommIRq",   0b01111111),  # clear interrupt request bits
-            ("CIU_DivIRq",    0b01111111),  # clear interrupt request bits
-        ]
+            ("CIU_DivIRq",    0b01111111))  # clear interrupt request bits
         if data is not None:
-            regs.extend(zip(len(data)*["CIU_FIFOData"], data))
-            regs.append(("CIU_BitFraming", 0b10000000))  # StartSend (b7=1)
-        self.chipset.write_register(*regs)
+            regs += self.chipset.fifo_register_data(data)
+            regs += self.chipset.register_data(
+                ("CIU_BitFraming", 0b10000000))  # StartSend (b7=1)
+        self.chipset.write_register_raw(regs)
 
         irq_regs = ("CIU_CommIRq", "CIU_DivIRq")
         time_to_return = time.time() + (timeout if timeout else 0)
@@ -1011,8 +1090,7 @@ class Device(device.Device):
             if commirq & 0b00100000:
                 self.chipset.write_register("CIU_CommIRq", 0b00100000)
                 fifo_size = self.chipset.read_register("CIU_FIFOLevel")
-                fifo_read = fifo_size * ["CIU_FIFOData"]
-                fifo_data = bytearray(self.chipset.read_register(*fifo_read))
+                fifo_data = self.chipset.read_fifo(fifo_size)
                 if fifo_data[0] != len(fifo_data):
                     raise nfc.clf.TransmissionError("frame length byte error")
                 return fifo_data
@@ -146,9 +146,21 @@ class TTY(object):
         if self.tty:
             self.tty.baudrate = value
 
+    def change_baudrate(self, value):
+        # Wait until the output buffer is transmitted (tcdrain on
+        # posix) and then switch the line speed. This lets the last
+        # frame leave at the old speed without a guessed sleep time.
+        if self.tty:
+            self.tty.flush()
+            self.tty.baudrate = value
+
     def read(self, timeout):
         if self.tty is not None:
-            self.tty.timeout = max(timeout/1E3, 0.05)
+            # Setting the timeout reconfigures the serial port (with a
+            # tcsetattr call on posix), so only do it when it changes.
+            timeout = max(timeout/1E3, 0.05)
+            if self.tty.timeout != timeout:
+                self.tty.timeout = timeout
             frame = bytearray(self.tty.read(6))
             if frame is None or len(frame) == 0:
                 raise IOError(errno.ETIMEDOUT, os.strerror(errno.ETIMEDOUT))
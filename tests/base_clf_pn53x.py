@@ -279,6 +279,13 @@ class TestChipset(object):
         with pytest.raises(NotImplementedError):
             nfc.clf.pn53x.Chipset(None, None).write_register(*args)
 
+    def test_register_data(self, chipset):
+        assert chipset.register_data(
+            (0x0102, 0x10), ("CIU_Mode", 0x11)) == HEX('0102 10 6301 11')
+        assert chipset.fifo_register_data(b'') == HEX('')
+        assert chipset.fifo_register_data(
+            HEX('0102')) == HEX('6339 01 6339 02')
+
     @pytest.mark.parametrize("args, command", [
         # (act_pass, br, passive_data, nfcid3, gi)
         ((False, 106, HEX(''), HEX(''), HEX('')),
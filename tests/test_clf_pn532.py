@@ -78,6 +78,7 @@ class TestChipset(base_clf_pn53x.TestChipset):
         ("GPIO", False, CMD('16 40 00')),
         ("I2C",  False, CMD('16 80 00')),
         ("HSU, SPI, I2C", True, CMD('16 B0 01')),
+        (("INT0", "RF", "I2C"), False, CMD('16 89 00')),
     ])
     def test_power_down(self, chipset, wakeup_enable, generate_irq, command):
         chipset.transport.read.side_effect = [ACK(), RSP('17 00')]
@@ -89,6 +90,36 @@ class TestChipset(base_clf_pn53x.TestChipset):
             chipset.power_down(wakeup_enable, generate_irq)
         assert excinfo.value.errno == 1
 
+    @pytest.mark.parametrize("cmd_code, cmd_data, frame", [
+        (0x14, HEX('010000'), CMD('14 010000')),
+        (0x00, HEX(256 * '00'), CMD('00' + 256 * '00')),
+    ])
+    def test_build_frame(self, chipset, cmd_code, cmd_data, frame):
+        assert chipset.build_frame(cmd_code, cmd_data) == frame
+        response = RSP('%02x' % (cmd_code + 1))
+        chipset.transport.read.side_effect = [ACK(), response]
+        assert chipset.command_frame(cmd_code, frame, 0.1) == HEX('')
+        assert chipset.transport.write.mock_calls == [call(frame)]
+
+    @pytest.mark.parametrize("count, command, response", [
+        (1, '06 6339', '07 01'),
+        (3, '06 6339 6339 6339', '07 010203'),
+    ])
+    def test_read_fifo(self, chipset, count, command, response):
+        chipset.transport.read.side_effect = [ACK(), RSP(response)]
+        assert chipset.read_fifo(count) == HEX(response[3:])
+        assert chipset.transport.read.mock_calls == [call(100), call(250)]
+        assert chipset.transport.write.mock_calls == [call(CMD(command))]
+
+    def test_write_register_raw(self, chipset):
+        chipset.transport.read.side_effect = [ACK(), RSP('09')]
+        assert chipset.write_register_raw(HEX('0102 10 6301 11')) is None
+        assert chipset.transport.read.mock_calls == [call(100), call(250)]
+        assert chipset.transport.write.mock_calls == [
+            call(CMD('08 0102 10 6301 11'))]
+        with pytest.raises(NotImplementedError):
+            nfc.clf.pn53x.Chipset(None, None).write_register_raw(HEX('0102'))
+
     def test_tg_init_as_target(self, chipset):
         chipset.transport.read.side_effect = [ACK(), RSP('8D 01 02 03')]
         mifare = HEX('010203040506')
@@ -183,13 +214,11 @@ class TestDevice(base_clf_pn53x.TestDevice):
         transport.write.reset_mock()
         transport.read.reset_mock()
         transport.read.side_effect = [
-            ACK(), RSP('11'),                             # SetSerialBaudrate
             ACK(), RSP('17 00'),                          # PowerDown
         ]
         device.close()
         assert transport.write.mock_calls == [call(_) for _ in [
             ACK(),                                        # cancel last cmd
-            CMD('10 04'), ACK(),                          # SetSerialBaudrate
             CMD('16 b000'),                               # PowerDown
         ]]
 
@@ -470,6 +499,22 @@ class TestDevice(base_clf_pn53x.TestDevice):
         device.chipset.transport = transport
         device.chipset.transport.TYPE = "TTY"
 
+    def test_close_transport_high_speed(self, device):
+        transport = device.chipset.transport
+        chipset = device.chipset
+        baudrate = PropertyMock(return_value=921600)
+        type(transport.tty).baudrate = baudrate
+        transport.read.side_effect = [ACK(), RSP('11')]
+        device.close()
+        assert transport.write.mock_calls == [call(_) for _ in [
+            ACK(),                                        # cancel last cmd
+            CMD('10 04'), ACK(),                          # SetSerialBaudrate
+        ]]
+        baudrate.assert_called_with(115200)
+        type(transport.tty).baudrate = PropertyMock(return_value=115200)
+        device.chipset = chipset
+        device.chipset.transport = transport
+
     def reg_rsp(self, hexdata):
         return RSP('07' + hexdata)
 
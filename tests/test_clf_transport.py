@@ -7,7 +7,7 @@ import nfc.clf.transport
 
 import pytest
 from pytest_mock import mocker  # noqa: F401
-from mock import call, MagicMock
+from mock import call, MagicMock, PropertyMock
 import termios
 import errno
 
@@ -207,6 +207,14 @@ class TestTTY(object):
         tty.baudrate = 9600
         assert tty.baudrate == 0
 
+    def test_change_baudrate(self, serial, tty):
+        tty.change_baudrate(921600)
+        assert serial.return_value.flush.mock_calls == [call()]
+        assert tty.baudrate == 921600
+        tty.tty = None
+        tty.change_baudrate(115200)
+        assert tty.baudrate == 0
+
     def test_read(self, serial, tty):
         serial.return_value.read.side_effect = [
             HEX('0000ff00ff00'),
@@ -244,6 +252,13 @@ class TestTTY(object):
         tty.tty = None
         assert tty.read(1000) is None
 
+    def test_read_with_same_timeout(self, serial, tty):
+        timeout = PropertyMock(return_value=0.1)
+        type(serial.return_value).timeout = timeout
+        serial.return_value.read.side_effect = [HEX('0000ff00ff00')]
+        assert tty.read(100) == b'\x00\x00\xff\x00\xff\x00'
+        assert timeout.mock_calls == [call()]
+
     def test_write(self, serial, tty):
         tty.write(b'12')
         serial.return_value.flushInput.assert_called_with()